@@ -4,7 +4,7 @@ Arm Servo Calibration Tool
 Use this to find the correct neutral and attack angles for each arm
 """
 
-import RPi.GPIO as GPIO
+import gpio_shim as GPIO
 import time
 
 # Arm servo pins
@@ -0,0 +1,124 @@
+"""
+Drop-in RPi.GPIO replacement backed by the pigpio daemon.
+
+The test scripts all talk to RPi.GPIO, whose PWM runs in per-pin
+userspace threads and jitters under load. Swapping the import for
+
+    import gpio_shim as GPIO
+
+gives every script pigpio's DMA-timed PWM and daemon-side I/O without
+touching the rest of the file: the shim mirrors the RPi.GPIO surface
+the scripts use (setmode/setup/input/output/PWM/event detection/
+cleanup) and delegates everything to one shared pigpio connection.
+Pin numbering is always BCM - pigpio knows nothing else - which is
+also the only mode any script here uses.
+"""
+
+import pigpio
+
+BCM = "BCM"
+IN = "in"
+OUT = "out"
+HIGH = 1
+LOW = 0
+PUD_OFF = pigpio.PUD_OFF
+PUD_UP = pigpio.PUD_UP
+PUD_DOWN = pigpio.PUD_DOWN
+FALLING = pigpio.FALLING_EDGE
+RISING = pigpio.RISING_EDGE
+BOTH = pigpio.EITHER_EDGE
+
+_pi = None
+_callbacks = {}
+
+
+def _get_pi():
+    global _pi
+    if _pi is None:
+        _pi = pigpio.pi()
+        if not _pi.connected:
+            raise RuntimeError("pigpio daemon not running - start it with 'sudo pigpiod'")
+    return _pi
+
+
+def setmode(mode):
+    pass  # pigpio is BCM-only; accepted for drop-in compatibility
+
+
+def setwarnings(flag):
+    pass
+
+
+def setup(pin, direction, pull_up_down=PUD_OFF):
+    pi = _get_pi()
+    if direction == OUT:
+        pi.set_mode(pin, pigpio.OUTPUT)
+    else:
+        pi.set_mode(pin, pigpio.INPUT)
+        pi.set_pull_up_down(pin, pull_up_down)
+
+
+def input(pin):
+    return _get_pi().read(pin)
+
+
+def output(pin, level):
+    _get_pi().write(pin, 1 if level else 0)
+
+
+def add_event_detect(pin, edge, callback=None, bouncetime=None):
+    pi = _get_pi()
+    if bouncetime:
+        pi.set_glitch_filter(pin, int(bouncetime) * 1000)  # ms -> us
+    fn = (lambda gpio, level, tick: callback(gpio)) if callback else None
+    _callbacks[pin] = pi.callback(pin, edge, fn)
+
+
+def remove_event_detect(pin):
+    cb = _callbacks.pop(pin, None)
+    if cb is not None:
+        cb.cancel()
+        _get_pi().set_glitch_filter(pin, 0)
+
+
+def wait_for_edge(pin, edge, timeout=None, bouncetime=None):
+    pi = _get_pi()
+    if bouncetime:
+        pi.set_glitch_filter(pin, int(bouncetime) * 1000)
+    wait_s = (timeout / 1000.0) if timeout else 3600.0
+    return pin if pi.wait_for_edge(pin, edge, wait_s) else None
+
+
+class PWM:
+    """RPi.GPIO.PWM lookalike on pigpio's DMA engine (no per-pin thread)."""
+
+    def __init__(self, pin, freq_hz):
+        self.pin = int(pin)
+        self.freq_hz = float(freq_hz)
+        _get_pi().set_mode(self.pin, pigpio.OUTPUT)
+
+    def start(self, duty):
+        self.ChangeDutyCycle(duty)
+
+    def ChangeDutyCycle(self, duty):
+        pulse_us = int(duty / 100.0 * 1_000_000.0 / self.freq_hz)
+        if pulse_us == 0 or 500 <= pulse_us <= 2500:
+            # Servo-range pulse (every script here drives servos at 50Hz)
+            _get_pi().set_servo_pulsewidth(self.pin, pulse_us)
+        else:
+            # Out of servo range (e.g. LED dimming): plain PWM duty
+            pi = _get_pi()
+            pi.set_PWM_frequency(self.pin, int(self.freq_hz))
+            pi.set_PWM_dutycycle(self.pin, int(duty * 255 / 100))
+
+    def stop(self):
+        _get_pi().set_servo_pulsewidth(self.pin, 0)
+
+
+def cleanup():
+    global _pi
+    for pin in list(_callbacks):
+        remove_event_detect(pin)
+    if _pi is not None:
+        _pi.stop()
+        _pi = None
@@ -1,4 +1,4 @@
-import RPi.GPIO as GPIO
+import gpio_shim as GPIO
 import time
 
 # Set GPIO mode to BCM (Broadcom SOC channel numbers)
@@ -1,23 +1,27 @@
 import spidev
 import time
+import numpy as np
 
 spi = spidev.SpiDev()
 spi.open(0, 0)
 spi.max_speed_hz = 1350000
 
-def read_adc(channel):
-    adc = spi.xfer2([1, (8 + channel) << 4, 0])
-    return ((adc[1] & 3) << 8) + adc[2]
+# One prebuilt 3-byte command per channel: start bit, single-ended +
+# channel, don't-care. Each conversion needs its own CS window - the
+# MCP3008 arms its start-bit detector once per CS assertion, so a
+# single batched frame would return data for channel 0 only.
+CMDS = [[1, (8 + ch) << 4, 0] for ch in range(8)]
+
+def read_all_adcs():
+    resp = np.array([spi.xfer2(list(cmd)) for cmd in CMDS], dtype=np.uint8)
+    return ((resp[:, 1].astype(np.uint16) & 3) << 8) | resp[:, 2]
 
 print("MCP3008 Diagnostic Test")
 print("Checking all channels...")
 print()
 
 while True:
-    values = []
-    for ch in range(8):
-        val = read_adc(ch)
-        values.append(val)
-    
+    values = read_all_adcs()
+
     print(f"CH0:{values[0]:4d} CH1:{values[1]:4d} CH2:{values[2]:4d} CH3:{values[3]:4d} CH4:{values[4]:4d} CH5:{values[5]:4d} CH6:{values[6]:4d} CH7:{values[7]:4d}")
-    time.sleep(0.2)
\ No newline at end of file
+    time.sleep(0.2)
@@ -17,11 +17,52 @@ into "hit" events with a mapped damage value.
 
 """
 
+import os # Realtime scheduling for the sampling thread
 import threading # For background sampling/processing
 import time
+import numpy as np # Preallocated event ring storage
 import spidev  # Used for MCP3008 SPI readings; Requires: sudo apt-get install python3-spidev
-from collections import deque # double-ended fast queue
-from typing import Deque, Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+def _process_tick(vals, baseline, alpha, one_minus_alpha, filter_on, threshold,
+                  boost_extra, boost_until_ms, mask_until_ms,
+                  last_hit_ms, debounce_ms, tick_ms):
+    """
+    One tick of per-channel processing: baseline filter update (in
+    place), boost expiry, and mask/threshold/debounce gating.
+
+    Returns (hit_positions, signal, eff_thr) - positions index into the
+    channel arrays. Kept as a pure function over arrays so Numba can
+    compile it (see below).
+    """
+    # Cast once up front so both branches yield a float32 signal -
+    # Numba cannot unify branch-dependent array dtypes, and the int32
+    # input would promote the filtered branch to float64.
+    vals = vals.astype(np.float32)
+    if filter_on:
+        baseline *= alpha
+        baseline += one_minus_alpha * vals
+        signal = vals - baseline
+    else:
+        signal = vals
+
+    boost_extra[tick_ms > boost_until_ms] = 0
+    eff_thr = threshold + boost_extra
+    hits = ((signal > eff_thr)
+            & (tick_ms >= mask_until_ms)
+            & (tick_ms - last_hit_ms >= debounce_ms))
+    return np.nonzero(hits)[0], signal, eff_thr
+
+
+try:
+    # With Numba installed the kernel runs as native code and releases
+    # the GIL, so the sampler truly overlaps the game loop. The
+    # pure-NumPy version above is the fallback and behaves identically.
+    from numba import njit
+    _process_tick = njit(cache=True, nogil=True)(_process_tick)
+except ImportError:
+    pass
+
 
 class PiezoSensorReader:
     """
@@ -33,7 +74,7 @@ class PiezoSensorReader:
         "channel": int,
         "value": int,          # raw 10-bit ADC (0..1023)
         "damage": float,       # post-mapped gameplay damage
-        "timestamp_ms": int    # event time in epoch ms
+        "timestamp_ms": int    # event time in monotonic ms (see _now_ms)
     }
     """
 
@@ -55,6 +96,7 @@ class PiezoSensorReader:
         hit_debounce_ms: int = 100, # Minimum time between hits on the same channel.
         queue_maxlen: int = 128, # Maximum number of pending events. Oldest events are dropped when full.
         baseline_alpha: float = 0.98, # Controls high-pass filter that ignores the slow limb movement
+        bb_pins: Optional[Tuple[int, int, int, int]] = None, # (CS, MISO, MOSI, SCLK) to bit-bang SPI via pigpio instead of spidev
     ) -> None:
 
         self.channels: Tuple[int, ...] = tuple(int(c) for c in channels)
@@ -65,31 +107,81 @@ class PiezoSensorReader:
         self.threshold: int = int(threshold)
         self.hit_debounce_ms: int = int(hit_debounce_ms)
 
+        # Per-channel state lives in NumPy arrays indexed by channel
+        # position (the channel tuple is fixed at construction), so the
+        # per-tick filter runs as a handful of vectorized array ops over
+        # all channels instead of N Python statements. _ch_pos
+        # translates a channel number to its position for the public API.
+        self._ch_pos: Dict[int, int] = {ch: i for i, ch in enumerate(self.channels)}
+        n = len(self.channels)
+
         # Baseline filter (simple high-pass via moving baseline subtraction).
+        # Derived coefficients are fixed after construction, so compute
+        # them once here rather than per tick (or per loop start).
         self.baseline_alpha: float = float(baseline_alpha)
-        self._baseline: Dict[int, float] = {ch: 0.0 for ch in self.channels}
+        self._one_minus_alpha: float = 1.0 - self.baseline_alpha
+        self._filter_on: bool = 0.0 <= self.baseline_alpha < 1.0
+        self._baseline: np.ndarray = np.zeros(n, dtype=np.float32)
 
         # State: last hit per channel (for debounce) and latest raw value per channel
-        self._last_hit_ms: Dict[int, int] = {ch: 0 for ch in self.channels}
-        self._latest: Dict[int, int] = {ch: 0 for ch in self.channels}
+        self._last_hit_ms: np.ndarray = np.zeros(n, dtype=np.int64)
+        self._latest: np.ndarray = np.zeros(n, dtype=np.int32)
 
         # Motion-aware gating: per-channel masks and temporary threshold boosts
-        self._mask_until_ms: Dict[int, int] = {ch: 0 for ch in self.channels}
-        self._boost_extra: Dict[int, int] = {ch: 0 for ch in self.channels}
-        self._boost_until_ms: Dict[int, int] = {ch: 0 for ch in self.channels}
-
-        # Lock-free ring buffer of events for the main loop to pop
-        self._events: Deque[dict] = deque(maxlen=queue_maxlen)
+        self._mask_until_ms: np.ndarray = np.zeros(n, dtype=np.int64)
+        self._boost_extra: np.ndarray = np.zeros(n, dtype=np.int32)
+        self._boost_until_ms: np.ndarray = np.zeros(n, dtype=np.int64)
+
+        # Lock-free single-producer/single-consumer event ring: the
+        # sampler thread writes a preallocated slot and only then
+        # advances _head; the consumer owns _tail. No locks, and no
+        # dict/GC churn per hit. Indices grow monotonically; the slot
+        # is index % size.
+        self._ring = np.zeros(queue_maxlen, dtype=[
+            ("channel", np.int16),
+            ("value", np.int16),
+            ("signal", np.float32),
+            ("damage", np.float32),
+            ("timestamp_ms", np.int64),
+        ])
+        self._ring_size = int(queue_maxlen)
+        self._head = 0  # producer's next write index
+        self._tail = 0  # consumer's next read index
 
         # Thread controls
         self._stop = threading.Event()
         self._thread = threading.Thread(target=self._loop, daemon=True)
 
-        # SPI setup (MCP3008 speaks SPI mode 0; 1 MHz is ample throughput)
-        self.spi = spidev.SpiDev()
-        self.spi.open(spi_bus, spi_dev) # CE0 by default
-        self.spi.max_speed_hz = 1_000_000
-        self.spi.mode = 0
+        # SPI setup (MCP3008 speaks SPI mode 0). The chip is only rated
+        # to 3.6MHz at 5V supply - on the Pi's 3.3V rail 2MHz is as far
+        # as we can push while keeping clean conversions.
+        #
+        # With bb_pins given, pigpio bit-bangs the bus instead: its DMA
+        # engine times the clock transitions, so sampling cadence is not
+        # at the mercy of the Linux scheduler, any four GPIOs can serve
+        # as the bus, and the hardware SPI pins stay free for the game.
+        self._pi = None
+        self._bb_cs = None
+        if bb_pins is not None:
+            import pigpio  # only needed for the bit-bang backend
+            cs, miso, mosi, sclk = bb_pins
+            self._pi = pigpio.pi()
+            if not self._pi.connected:
+                raise RuntimeError("pigpio daemon not running - start it with 'sudo pigpiod'")
+            self._pi.bb_spi_open(cs, miso, mosi, sclk, 1_000_000, 0)
+            self._bb_cs = cs
+            self.spi = None
+        else:
+            self.spi = spidev.SpiDev()
+            self.spi.open(spi_bus, spi_dev) # CE0 by default
+            self.spi.max_speed_hz = 2_000_000
+            self.spi.mode = 0
+
+        # One prebuilt 3-byte command per channel. Each conversion must
+        # be its own transaction: the MCP3008 arms its start-bit
+        # detector once per CS assertion, so batching several commands
+        # into a single CS window returns data only for the first.
+        self._tx_cmds = [[1, (8 | ch) << 4, 0] for ch in self.channels]
 
     # ---- Public API ----------------------------------------------------------
 
@@ -105,39 +197,71 @@ class PiezoSensorReader:
         if self._thread.is_alive():
             self._thread.join(timeout=2.0)
         try:
-            self.spi.close()
+            if self._pi is not None:
+                self._pi.bb_spi_close(self._bb_cs)
+                self._pi.stop()
+            else:
+                self.spi.close()
         except Exception:
             pass
 
+    @staticmethod
+    def _now_ms() -> int:
+        """Millisecond timestamp on the monotonic clock.
+
+        All debounce/mask/boost bookkeeping compares timestamps, so the
+        clock must never jump - time.time() does on NTP corrections,
+        which could swallow hits or extend masks mid-game. monotonic_ns
+        with integer division avoids both the jumps and the float
+        round-trip.
+        """
+        return time.monotonic_ns() // 1_000_000
+
     def get_latest(self, ch: int) -> int:
         """Return the most recent raw value for an ADC channel (0 if unknown)."""
-        return int(self._latest.get(int(ch), 0))
+        pos = self._ch_pos.get(int(ch))
+        return 0 if pos is None else int(self._latest[pos])
 
     # --- Motion-aware controls (call these from servo code) ---------
     def mask_channels(self, channels: Iterable[int], duration_ms: int) -> None:
         """Ignore hits on these channels for `duration_ms` from *now*."""
-        now = int(time.time() * 1000)
+        now = self._now_ms()
         for ch in channels:
-            ch = int(ch)
-            self._mask_until_ms[ch] = max(self._mask_until_ms.get(ch, 0), now + int(duration_ms))
+            pos = self._ch_pos.get(int(ch))
+            if pos is not None:
+                self._mask_until_ms[pos] = max(self._mask_until_ms[pos], now + int(duration_ms))
 
     def boost_threshold(self, channels: Iterable[int], extra: int, duration_ms: int) -> None:
         """Temporarily raise threshold by `extra` ADC counts on channels.
         Less aggressive than masking; good while the limb is moving.
         """
-        now = int(time.time() * 1000)
+        now = self._now_ms()
         for ch in channels:
-            ch = int(ch)
-            self._boost_extra[ch] = max(int(extra), self._boost_extra.get(ch, 0))
-            self._boost_until_ms[ch] = max(self._boost_until_ms.get(ch, 0), now + int(duration_ms))
+            pos = self._ch_pos.get(int(ch))
+            if pos is not None:
+                self._boost_extra[pos] = max(int(extra), self._boost_extra[pos])
+                self._boost_until_ms[pos] = max(self._boost_until_ms[pos], now + int(duration_ms))
 
     def pop_events(self, max_items: int = 16) -> List[dict]:
         """
         Drain up to `max_items` events from the queue (oldest first).
         Non-blocking: returns an empty list if there are no events.
         """
-        n = min(max_items, len(self._events))
-        return [self._events.popleft() for _ in range(n)]
+        head = self._head  # snapshot; producer may advance it meanwhile
+        tail = self._tail
+        n = min(max_items, head - tail)
+        events = []
+        for idx in range(tail, tail + n):
+            e = self._ring[idx % self._ring_size]
+            events.append({
+                "channel": int(e["channel"]),
+                "value": int(e["value"]),
+                "signal": float(e["signal"]),
+                "damage": float(e["damage"]),
+                "timestamp_ms": int(e["timestamp_ms"]),
+            })
+        self._tail = tail + n
+        return events
 
     # ---- Internals -----------------------------------------------------------
 
@@ -153,7 +277,10 @@ class PiezoSensorReader:
         ch = int(ch)
         if not (0 <= ch <= 7):
             raise ValueError("MCP3008 channel must be 0..7")
-        resp = self.spi.xfer2([0b00000001, (0b1000 | ch) << 4, 0])
+        if self._pi is not None:
+            _, resp = self._pi.bb_spi_xfer(self._bb_cs, bytes([0b00000001, (0b1000 | ch) << 4, 0]))
+        else:
+            resp = self.spi.xfer3([0b00000001, (0b1000 | ch) << 4, 0])
         value = ((resp[1] & 0b00000011) << 8) | resp[2]  # 10-bit value
         return value
 
@@ -173,55 +300,105 @@ class PiezoSensorReader:
 
     def _loop(self) -> None:
         """Sampling loop aimed at a steady `sample_dt` period (100 Hz by default)."""
-        now_ms = lambda: int(time.time() * 1000)
-
-        while not self._stop.is_set():
-            t0 = time.perf_counter()
-            tick_ms = now_ms()
-
-            # Read each requested channel once per tick
-            for ch in self.channels:
-                val = self._read_adc(ch)
-                self._latest[ch] = val
-
-                # Update baseline: y[n] = α*y[n-1] + (1-α)*x[n]
-                if 0.0 <= self.baseline_alpha < 1.0:
-                    self._baseline[ch] = self.baseline_alpha * self._baseline[ch] + (1.0 - self.baseline_alpha) * val
-                    signal = val - self._baseline[ch]
-                else:
-                    signal = float(val)
-
-                # Respect masks and temporary threshold boosts
-                if tick_ms < self._mask_until_ms[ch]:
-                    continue  # fully ignore this channel during self-motion
-
-                if tick_ms > self._boost_until_ms[ch]:
-                    self._boost_extra[ch] = 0  # boost expired
-
-                eff_thr = self.threshold + self._boost_extra[ch]
-
-                # Threshold + debounce on the high-pass filtered signal
-                if signal > eff_thr:
-                    last = self._last_hit_ms[ch]
-                    if tick_ms - last >= self.hit_debounce_ms:
-                        self._events.append({
-                            "channel": ch,
-                            "value": int(val),
-                            "signal": float(signal),
-                            "damage": self._map_damage(signal, eff_thr),
-                            "timestamp_ms": tick_ms,
-                        })
-                        self._last_hit_ms[ch] = tick_ms
-
-            # Maintain cadence (compensate for SPI + loop overhead)
-            elapsed = time.perf_counter() - t0
-            sleep = self.sample_dt - elapsed
-            if sleep > 0:
-                time.sleep(sleep)
+        # Ask the kernel for realtime FIFO scheduling so a busy game
+        # loop (or GC pause) can't preempt a sample out of its slot.
+        # Needs root or CAP_SYS_NICE; without it we quietly stay on the
+        # default scheduler.
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+        except (PermissionError, OSError):
+            pass
+        # Keep the sampler off core 0 (the game loop pins itself there)
+        # so the two hot threads never share a core or its caches. With
+        # isolcpus=2,3 on the kernel command line this core is otherwise
+        # idle. Best effort, like the scheduler request above.
+        try:
+            os.sched_setaffinity(0, {2})
+        except (OSError, ValueError):
+            pass
+
+        # Bind everything the 100Hz body touches to locals once:
+        # LOAD_FAST instead of a self.__dict__ lookup per use. The
+        # config values never change after construction.
+        _now_ms = self._now_ms
+        _perf = time.perf_counter
+        _sleep = time.sleep
+        channels = self.channels
+        tx_cmds = self._tx_cmds
+        baseline = self._baseline
+        latest = self._latest
+        last_hit_ms = self._last_hit_ms
+        mask_until_ms = self._mask_until_ms
+        boost_extra = self._boost_extra
+        boost_until_ms = self._boost_until_ms
+        threshold = self.threshold
+        alpha = self.baseline_alpha
+        one_minus_alpha = self._one_minus_alpha
+        filter_on = self._filter_on
+        debounce_ms = self.hit_debounce_ms
+        sample_dt = self.sample_dt
+        ring = self._ring
+        ring_size = self._ring_size
+        map_damage = self._map_damage
+        stop_set = self._stop.is_set
+        if self._pi is not None:
+            bb_xfer = self._pi.bb_spi_xfer
+            bb_cs = self._bb_cs
+            bb_frames = [bytes(cmd) for cmd in tx_cmds]
+            read_all = lambda: [bb_xfer(bb_cs, f)[1] for f in bb_frames]
+        else:
+            spi_xfer = self.spi.xfer2  # xfer2 holds CS for exactly one command
+            read_all = lambda: [spi_xfer(list(cmd)) for cmd in tx_cmds]
+
+        # Pace against absolute deadlines rather than per-tick elapsed
+        # time: sleeping (sample_dt - elapsed) lets every oversleep and
+        # measurement gap accumulate, so "100Hz" drifts slow. Advancing
+        # a fixed deadline by sample_dt each tick makes the errors
+        # cancel instead of compound.
+        deadline = _perf() + sample_dt
+
+        while not stop_set():
+            tick_ms = _now_ms()
+
+            # One CS window per channel (MCP3008 protocol requirement),
+            # then decode all the 10-bit values in one vectorized shot
+            frame = np.array(read_all(), dtype=np.uint8)
+            vals = ((frame[:, 1] & 0b00000011).astype(np.int32) << 8) | frame[:, 2]
+            latest[:] = vals  # in place: public get_latest sees it
+
+            # Baseline filter, boost expiry, and hit gating run in the
+            # (possibly Numba-compiled) tick kernel
+            hit_pos, signal, eff_thr = _process_tick(
+                vals, baseline, alpha, one_minus_alpha, filter_on, threshold,
+                boost_extra, boost_until_ms, mask_until_ms,
+                last_hit_ms, debounce_ms, tick_ms)
+
+            # Hits are rare - only they drop back into Python
+            for i in hit_pos:
+                head = self._head
+                if head - self._tail < ring_size:
+                    # Fill the slot first, then publish by advancing
+                    # _head (if the ring is full the hit is dropped; a
+                    # draining consumer never lets 128 events back up)
+                    slot = ring[head % ring_size]
+                    slot["channel"] = channels[i]
+                    slot["value"] = vals[i]
+                    slot["signal"] = signal[i]
+                    slot["damage"] = map_damage(signal[i], eff_thr[i])
+                    slot["timestamp_ms"] = tick_ms
+                    self._head = head + 1
+                last_hit_ms[i] = tick_ms
+
+            # Maintain cadence: sleep until the next absolute deadline
+            remaining = deadline - _perf()
+            if remaining > 0:
+                _sleep(remaining)
+                deadline += sample_dt
             else:
-                # If we ever fall behind, don't call sleep(<negative>).
-                # (Occasional misses are fine; gameplay is tolerant to jitter.)
-                pass
+                # Fell behind (SPI stall, scheduler hiccup). Resync to
+                # now rather than burning ticks back-to-back trying to
+                # catch up; gameplay is tolerant to the odd missed sample.
+                deadline = _perf() + sample_dt
 
 
 # testing
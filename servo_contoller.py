@@ -4,7 +4,7 @@ Functions: move_platform(), punch(), kick(), return_to_neutral()
 
 -----PROTOTYPE GIVEN BY CHATGPT; TESTING REQUIRED-----
 
-Servo controller for Raspberry Pi using RPi.GPIO software PWM.
+Servo controller for Raspberry Pi using kernel pwm-gpio or pigpio PWM.
 
 Supports:
 180° positional micro-servos (e.g., SG90) for limb motion (punch/kick macros)
@@ -13,66 +13,139 @@ Supports:
 Standard hobby servos expect ~50 Hz control with a pulse width near 1.0–2.0 ms.
 For positional servos, map angle→pulse (0°→~1.0 ms, 180°→~2.0 ms).
 For continuous servos, 1.5 ms is "stop", and offsets around that command speed
-and direction. Wrap PWM in a tiny class with a lock to avoid race conditions
-when multiple motions run back-to-back, and provide game-friendly macros:
+and direction. Wrap PWM in a tiny class, and provide game-friendly macros:
 punch/kick = swing to (neutral + Δ), hold, then return, with a brief cooldown.
 
 """
 
+import os
+import queue
 import time
 import threading
-from typing import Optional
-
-import RPi.GPIO as GPIO
-
-GPIO.setmode(GPIO.BCM) # Use BCM pin numbers (e.g., GPIO 17, 27, 22)
-GPIO.setwarnings(False)
-
-# ---- Helpers: pulse↔duty ----------------------------------------------------
-
-def _pulse_to_duty(pulse_ms: float, period_ms: float = 20.0) -> float:
-    """Convert a pulse width (ms) to % duty-cycle at 50 Hz (20 ms period)."""
-    return (float(pulse_ms) / float(period_ms)) * 100.0
-
-def _angle_to_pulse_ms(angle_deg: float, *, min_ms: float = 1.0, max_ms: float = 2.0) -> float:
-    """Map 0..180° to [min_ms..max_ms]. Real servos may need tuning."""
-    a = max(0.0, min(180.0, float(angle_deg)))
-    return min_ms + (max_ms - min_ms) * (a / 180.0)
-
-def _speed_to_pulse_ms(speed: float, *, neutral_ms: float = 1.5, span_ms: float = 0.40) -> float:
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pigpio
+
+# BCM pin -> (pwmchip index, channel) for pins driven by the kernel
+# pwm-gpio driver. Each "dtoverlay=pwm-gpio,gpio=N" line in
+# /boot/config.txt creates its own single-channel pwmchip (channel 0),
+# numbered in the order the overlays load after the SoC's built-in
+# chips. Pins listed here get kernel-timed pulses; unlisted pins fall
+# back to pigpio's DMA servo pulses.
+PWM_GPIO_CHIPS: Dict[int, Tuple[int, int]] = {}
+
+# One shared daemon connection for every pigpio-backed servo: the
+# daemon multiplexes all servo pins onto a single DMA-driven waveform,
+# so N servos cost one connection and zero Python PWM threads (RPi.GPIO
+# spawned one C thread per PWM pin - six threads for a 2-fighter rig).
+_pi: Optional["pigpio.pi"] = None
+
+def _get_pi() -> "pigpio.pi":
+    global _pi
+    if _pi is None:
+        _pi = pigpio.pi()
+        if not _pi.connected:
+            raise RuntimeError("pigpio daemon not running - start it with 'sudo pigpiod'")
+    return _pi
+
+# ---- Helpers: angle/speed → pulse -------------------------------------------
+
+# Servos don't resolve better than ~1us, so the whole pipeline works in
+# integer microseconds: no float round-trips, and the result feeds both
+# backends' native int parameter directly.
+
+def _angle_to_pulse_us(angle_deg: int, *, min_us: int = 1000, max_us: int = 2000) -> int:
+    """Map 0..180° to [min_us..max_us]. Real servos may need tuning."""
+    a = max(0, min(180, int(angle_deg)))
+    return min_us + (max_us - min_us) * a // 180
+
+def _speed_to_pulse_us(speed_pct: int, *, neutral_us: int = 1500, span_us: int = 400) -> int:
     """
-    Map speed in [-1..+1] to a pulse around neutral (1.5 ms).
-    span_ms determines the pulse offset at full speed (typ. 0.35–0.50 ms).
+    Map speed in percent [-100..+100] to a pulse around neutral (1500 us).
+    span_us determines the pulse offset at full speed (typ. 350-500 us).
     """
-    s = max(-1.0, min(1.0, float(speed)))
-    return neutral_ms + span_ms * s
+    s = max(-100, min(100, int(speed_pct)))
+    return neutral_us + span_us * s // 100
 
 # ---- Core PWM wrapper -------------------------------------------------------
 
 class ServoPWM:
-    """Lightweight 50 Hz PWM wrapper around RPi.GPIO.PWM with a small thread lock."""
-    def __init__(self, pin: int, *, freq_hz: float = 50.0) -> None:
-        self.pin = int(pin)
-        self._lock = threading.Lock()
+    """
+    Lightweight 50 Hz PWM wrapper.
+
+    Pins mapped in PWM_GPIO_CHIPS are driven by the kernel pwm-gpio
+    driver through /sys/class/pwm: the pulse train comes from a kernel
+    hrtimer, so it doesn't jitter when Python is busy and costs no
+    background thread. Duty updates are a single pwrite to a cached fd,
+    which the kernel applies atomically. Unmapped pins on GPIO
+    12/13/18/19 use the SoC's hardware PWM peripheral via pigpio -
+    clock-timed edges, zero CPU, which matters most for the continuous
+    wheel servos where jitter is visible as wobble. Remaining pins go
+    through pigpio's DMA servo pulses. All backends serialise updates
+    themselves, so no per-instance lock is needed.
+    """
 
-        GPIO.setup(self.pin, GPIO.OUT)
-        self._pwm = GPIO.PWM(self.pin, freq_hz)
-        self._pwm.start(0.0)  # 0% duty = no pulse (idle)
+    # GPIOs wired to the SoC's two hardware PWM channels
+    _HW_PWM_PINS = (12, 13, 18, 19)
 
-    def set_pulse_ms(self, pulse_ms: float) -> None:
-        """Set the instantaneous pulse width in milliseconds."""
-        duty = _pulse_to_duty(pulse_ms)
-        with self._lock:
-            self._pwm.ChangeDutyCycle(duty)
+    def __init__(self, pin: int, *, freq_hz: float = 50.0) -> None:
+        self.pin = int(pin)
+        self._duty_fd: Optional[int] = None
+        self._pi = None
+        self._hw_freq = 0  # nonzero = hardware PWM peripheral in use
+
+        chip_ch = PWM_GPIO_CHIPS.get(self.pin)
+        if chip_ch is not None:
+            chip, ch = chip_ch
+            base = f"/sys/class/pwm/pwmchip{chip}"
+            if not os.path.isdir(f"{base}/pwm{ch}"):
+                with open(f"{base}/export", "w") as f:
+                    f.write(str(ch))
+            self._pwm_dir = f"{base}/pwm{ch}"
+            period_ns = int(round(1e9 / float(freq_hz)))
+            with open(f"{self._pwm_dir}/period", "w") as f:
+                f.write(str(period_ns))  # written once; only duty changes after
+            self._duty_fd = os.open(f"{self._pwm_dir}/duty_cycle", os.O_WRONLY)
+            os.pwrite(self._duty_fd, b"0", 0)
+            with open(f"{self._pwm_dir}/enable", "w") as f:
+                f.write("1")
+        elif self.pin in self._HW_PWM_PINS:
+            self._pi = _get_pi()
+            self._hw_freq = int(freq_hz)
+            self._pi.hardware_PWM(self.pin, self._hw_freq, 0)  # no pulse (idle)
+        else:
+            self._pi = _get_pi()
+            self._pi.set_servo_pulsewidth(self.pin, 0)  # no pulse (idle)
+
+    def set_pulse_us(self, pulse_us: int) -> None:
+        """Set the instantaneous pulse width in integer microseconds."""
+        if self._duty_fd is not None:
+            os.pwrite(self._duty_fd, str(pulse_us * 1000).encode(), 0)
+            return
+        if self._hw_freq:
+            # pigpio duty is parts-per-million of the period;
+            # period_us = 1e6/freq, so ppm = pulse_us * freq
+            self._pi.hardware_PWM(self.pin, self._hw_freq, pulse_us * self._hw_freq)
+            return
+        self._pi.set_servo_pulsewidth(self.pin, pulse_us)
 
     def stop(self) -> None:
         """Stop PWM on this pin and release it."""
-        with self._lock:
+        if self._duty_fd is not None:
             try:
-                self._pwm.ChangeDutyCycle(0.0)
-                self._pwm.stop()
+                os.pwrite(self._duty_fd, b"0", 0)
+                with open(f"{self._pwm_dir}/enable", "w") as f:
+                    f.write("0")
             finally:
-                GPIO.setup(self.pin, GPIO.IN)
+                os.close(self._duty_fd)
+                self._duty_fd = None
+            return
+        if self._hw_freq:
+            self._pi.hardware_PWM(self.pin, 0, 0)
+            return
+        self._pi.set_servo_pulsewidth(self.pin, 0)
 
 # ---- 180° positional servo --------------------------------------------------
 
@@ -88,15 +161,25 @@ class LimbServo:
     ) -> None:
         self.pwm = ServoPWM(pin)
         self.neutral_deg = float(neutral_deg)
-        self.min_ms = float(min_ms)
-        self.max_ms = float(max_ms)
+        # Calibration kwargs stay in ms for readability; everything past
+        # this point is integer microseconds
+        self.min_us = int(round(min_ms * 1000.0))
+        self.max_us = int(round(max_ms * 1000.0))
+
+        # 1-degree resolution is plenty for these servos, so precompute
+        # the angle->pulse mapping once; goto becomes a clamp + index
+        # instead of a function call and float math per update.
+        self._pulse_lut = tuple(
+            _angle_to_pulse_us(a, min_us=self.min_us, max_us=self.max_us)
+            for a in range(181)
+        )
 
         # On construction, park at neutral (helps avoid twitch on boot)
         self.goto(self.neutral_deg)
 
     def goto(self, angle_deg: float) -> None:
-        pulse_ms = _angle_to_pulse_ms(angle_deg, min_ms=self.min_ms, max_ms=self.max_ms)
-        self.pwm.set_pulse_ms(pulse_ms)
+        a = int(angle_deg)
+        self.pwm.set_pulse_us(self._pulse_lut[a if 0 <= a <= 180 else (0 if a < 0 else 180)])
 
     def neutral(self) -> None:
         self.goto(self.neutral_deg)
@@ -119,13 +202,22 @@ class WheelServo:
         span_ms: float = 0.40,
     ) -> None:
         self.pwm = ServoPWM(pin)
-        self.neutral_ms = float(neutral_ms)
-        self.span_ms = float(span_ms)
+        # Calibration kwargs stay in ms; internal state is integer us
+        self.neutral_us = int(round(neutral_ms * 1000.0))
+        self.span_us = int(round(span_ms * 1000.0))
+
+        # Same precomputation as LimbServo: speed quantized to 1% steps,
+        # 201 entries covering -1.00..+1.00 (index = int(speed*100)+100)
+        self._pulse_lut = tuple(
+            _speed_to_pulse_us(s, neutral_us=self.neutral_us, span_us=self.span_us)
+            for s in range(-100, 101)
+        )
+
         self.stop()  # ensure we're stationary
 
     def set_speed(self, speed: float) -> None:
-        pulse_ms = _speed_to_pulse_ms(speed, neutral_ms=self.neutral_ms, span_ms=self.span_ms)
-        self.pwm.set_pulse_ms(pulse_ms)
+        i = int(speed * 100.0) + 100
+        self.pwm.set_pulse_us(self._pulse_lut[i if 0 <= i <= 200 else (0 if i < 0 else 200)])
 
     def move(self, direction: str, *, speed: float = 0.7, duration_s: float = 0.4) -> None:
         """
@@ -138,13 +230,58 @@ class WheelServo:
         self.stop()
 
     def stop(self) -> None:
-        self.pwm.set_pulse_ms(self.neutral_ms)
+        self.pwm.set_pulse_us(self.neutral_us)
 
     def halt(self) -> None:
         """Hard stop and release the PWM pin."""
         self.stop()
         self.pwm.stop()
 
+# ---- Structure-of-arrays bank for coordinated motion ------------------------
+
+class ActuatorBank:
+    """
+    Flat pulse-width state for a group of servos, kept as parallel
+    NumPy arrays instead of one wrapper object per pin.
+
+    For dense numeric updates - coordinated poses, future interpolated
+    motion - going through N LimbServo method chains costs a Python
+    frame and float math per pin per tick. Here the whole group is
+    three int32 arrays: compute new pulse widths vectorized, then
+    flush() sends only the entries that actually changed through the
+    shared pigpio connection. The per-servo classes above remain the
+    right tool for one-off macros; this is the bulk path.
+    """
+    def __init__(self, pins: Iterable[int], *, neutral_us: int = 1500) -> None:
+        self.pins = np.asarray(list(pins), dtype=np.int32)
+        if self.pins.size == 0:
+            raise ValueError("At least one servo pin is required.")
+        self.neutral_us = np.full(self.pins.size, int(neutral_us), dtype=np.int32)
+        self.pulse_us = self.neutral_us.copy()
+        self._sent_us = np.zeros(self.pins.size, dtype=np.int32)  # 0 = no pulse yet
+        self._pi = _get_pi()
+
+    def goto_deg(self, idx: int, angle_deg: float, *, min_us: int = 1000, max_us: int = 2000) -> None:
+        """Stage an angle for one servo (flush() actually sends it)."""
+        a = int(angle_deg)
+        a = 0 if a < 0 else (180 if a > 180 else a)
+        self.pulse_us[idx] = min_us + (max_us - min_us) * a // 180
+
+    def flush(self) -> None:
+        """Send every staged pulse width that differs from the last sent."""
+        changed = np.nonzero(self.pulse_us != self._sent_us)[0]
+        set_pw = self._pi.set_servo_pulsewidth
+        for i in changed:
+            set_pw(int(self.pins[i]), int(self.pulse_us[i]))
+        self._sent_us[changed] = self.pulse_us[changed]
+
+    def relax(self) -> None:
+        """Cut pulses on every pin in the bank."""
+        set_pw = self._pi.set_servo_pulsewidth
+        for p in self.pins:
+            set_pw(int(p), 0)
+        self._sent_us[:] = 0
+
 # ---- High-level macros for one fighter -------------------------------------
 
 class FighterActuators:
@@ -152,31 +289,99 @@ class FighterActuators:
     High-level motions for a single fighter:
       • arm (LimbServo), leg (LimbServo), wheel (WheelServo)
       • attack macro: swing → brief hold → return → cooldown
-    The internal lock serializes attacks so punch/kick don't overlap mechanically.
+    Attacks run on a single worker thread fed by a queue: punch/kick
+    return immediately instead of blocking their caller for the ~700ms
+    macro, and the worker serializes attacks so they don't overlap
+    mechanically (no lock needed - only the worker touches the limbs).
     """
     def __init__(self, arm_pin: int, leg_pin: int, wheel_pin: int) -> None:
         self.arm = LimbServo(arm_pin, neutral_deg=90)
         self.leg = LimbServo(leg_pin, neutral_deg=90)
         self.wheel = WheelServo(wheel_pin)
-        self._attack_lock = threading.Lock()
+        self._q: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._drain, daemon=True)
+        self._worker.start()
 
     # Platform movement on rails
     def move_platform(self, direction: str, *, speed: float = 0.7, duration_s: float = 0.4) -> None:
         self.wheel.move(direction, speed=speed, duration_s=duration_s)
 
-    # Attack macro (blocking by design — short and simple for gameplay scripting)
+    @staticmethod
+    def _enter_rt() -> None:
+        """
+        Promote the calling thread to SCHED_FIFO so the hold/cooldown
+        windows don't stretch by 10+ ms whenever the sensor loop or
+        input poll contends for CPU. Needs root or CAP_SYS_NICE;
+        without it (or off Linux) we quietly stay on the default
+        scheduler. Idempotent, so calling per attack is harmless.
+        """
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(40))
+        except (AttributeError, PermissionError, OSError):
+            pass
+
+    def _drain(self) -> None:
+        """Worker loop: execute queued attacks one at a time.
+
+        Coalescing happens in a per-limb 'latest pending swing' map
+        plus a first-arrival order deque, never by requeueing: a
+        rapid-fire limb just overwrites its pending swing while other
+        limbs keep their place in line, so ordering is preserved and
+        no limb can starve another. The shutdown sentinel is honored
+        only once everything already accepted has run.
+        """
+        self._enter_rt()
+        q = self._q
+        pending: dict = {}    # limb -> newest queued swing
+        order = deque()       # limbs in first-arrival order
+        stopping = False
+        while True:
+            # Block only when idle and not shutting down; otherwise
+            # soak up whatever has arrived without blocking
+            try:
+                item = q.get() if not (order or stopping) else q.get_nowait()
+                while True:
+                    if item is None:
+                        stopping = True
+                    else:
+                        servo, swing_deg = item
+                        if servo not in pending:
+                            order.append(servo)
+                        pending[servo] = swing_deg
+                    item = q.get_nowait()
+            except queue.Empty:
+                pass
+            if order:
+                servo = order.popleft()
+                self._attack(servo, swing_deg=pending.pop(servo))
+            elif stopping:
+                return
+
+    # Attack macro (runs only on the worker thread)
     def _attack(self, servo: LimbServo, *, swing_deg: float = 90.0, hold_ms: int = 200, cooldown_ms: int = 500) -> None:
-        with self._attack_lock:
-            servo.goto(servo.neutral_deg + swing_deg)       # swing forward
-            time.sleep(hold_ms / 1000.0)                    # brief contact window
-            servo.neutral()                                  # retract
-            time.sleep(cooldown_ms / 1000.0)                # cooldown (prevents flapping)
+        # Phases sleep to absolute deadlines off one start stamp:
+        # plain sleep(hold_ms) wakes late and each overshoot would push
+        # the next phase later, so retract/cooldown times drift.
+        # Sleeping only the *remaining* time to each deadline lets the
+        # overshoot of one phase eat into the next sleep instead of
+        # accumulating.
+        _now = time.clock_gettime_ns
+        t0 = _now(time.CLOCK_MONOTONIC)
+        servo.goto(servo.neutral_deg + swing_deg)       # swing forward
+        remaining = t0 + hold_ms * 1_000_000 - _now(time.CLOCK_MONOTONIC)
+        if remaining > 0:
+            time.sleep(remaining / 1e9)                  # brief contact window
+        servo.neutral()                                  # retract
+        remaining = (t0 + (hold_ms + cooldown_ms) * 1_000_000
+                     - _now(time.CLOCK_MONOTONIC))
+        if remaining > 0:
+            time.sleep(remaining / 1e9)                  # cooldown
 
     def punch(self, *, swing_deg: float = 90.0) -> None:
-        self._attack(self.arm, swing_deg=swing_deg)
+        self._q.put((self.arm, swing_deg))
 
     def kick(self, *, swing_deg: float = 90.0) -> None:
-        self._attack(self.leg, swing_deg=swing_deg)
+        self._q.put((self.leg, swing_deg))
 
     def return_to_neutral(self) -> None:
         self.arm.neutral()
@@ -184,12 +389,13 @@ class FighterActuators:
         self.wheel.stop()
 
     def shutdown(self) -> None:
-        """Return servos to safe state and clean up GPIO."""
+        """Return servos to safe state and release their PWM backends."""
+        self._q.put(None)
+        self._worker.join(timeout=2.0)
         self.return_to_neutral()
         self.arm.stop()
         self.leg.stop()
         self.wheel.halt()
-        GPIO.cleanup()
 
 # testing
 '''
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import RPi.GPIO as GPIO
+import pigpio
 import time
 
 # Player 1 arms
@@ -10,57 +10,78 @@ P1_LEFT_SERVO_PIN = 19
 P2_RIGHT_SERVO_PIN = 26
 P2_LEFT_SERVO_PIN = 7
 
-GPIO.setmode(GPIO.BCM)
-GPIO.setup(P1_RIGHT_SERVO_PIN, GPIO.OUT)
-GPIO.setup(P1_LEFT_SERVO_PIN, GPIO.OUT)
-GPIO.setup(P2_RIGHT_SERVO_PIN, GPIO.OUT)
-GPIO.setup(P2_LEFT_SERVO_PIN, GPIO.OUT)
+ARM_PINS = (P1_RIGHT_SERVO_PIN, P1_LEFT_SERVO_PIN,
+            P2_RIGHT_SERVO_PIN, P2_LEFT_SERVO_PIN)
 
-# Set up PWM at 50Hz for all arms
-p1_right_pwm = GPIO.PWM(P1_RIGHT_SERVO_PIN, 50)
-p1_left_pwm = GPIO.PWM(P1_LEFT_SERVO_PIN, 50)
-p2_right_pwm = GPIO.PWM(P2_RIGHT_SERVO_PIN, 50)
-p2_left_pwm = GPIO.PWM(P2_LEFT_SERVO_PIN, 50)
+# Pulse widths (us) for the three test angles, precomputed once.
+# Same mapping as the old duty formula: 2.5% duty = 0.5ms, 12.5% = 2.5ms.
+PULSE_US = {angle: 500 + angle * 2000 // 180 for angle in (0, 90, 180)}
 
-p1_right_pwm.start(0)
-p1_left_pwm.start(0)
-p2_right_pwm.start(0)
-p2_left_pwm.start(0)
+pi = pigpio.pi()
+if not pi.connected:
+    raise RuntimeError("pigpio daemon not running - start it with 'sudo pigpiod'")
 
-def set_angle(pwm, angle):
-    duty = 2.5 + (angle / 180.0) * 10.0
-    pwm.ChangeDutyCycle(duty)
+for pin in ARM_PINS:
+    pi.set_mode(pin, pigpio.OUTPUT)
+    pi.write(pin, 0)
+
+FRAME_US = 20000  # 50Hz servo frame
+
+def make_pose_wave(angles):
+    """
+    Build one repeating 20ms waveform that pulses all four arms.
+
+    The four ChangeDutyCycle calls this replaces each went through a
+    separate software-PWM thread, so the arms stepped tens of ms apart.
+    Here all four pulses live in a single DMA-timed frame: one request
+    per pose, and the arms move in lockstep.
+    """
+    pulses = []
+    used = 0
+    for pin, angle in zip(ARM_PINS, angles):
+        pw = PULSE_US[angle]
+        pulses.append(pigpio.pulse(1 << pin, 0, pw))
+        pulses.append(pigpio.pulse(0, 1 << pin, 0))
+        used += pw
+    pulses.append(pigpio.pulse(0, 0, FRAME_US - used))  # pad to 20ms
+    pi.wave_add_generic(pulses)
+    return pi.wave_create()
+
+# Prebuild one wave per pose so the loop just selects a wave ID
+NEUTRAL_WAVE = make_pose_wave((0, 180, 0, 180))   # left arms mirrored
+ATTACK_WAVE = make_pose_wave((90, 90, 90, 90))
+
+def hold_pose(wave_id, seconds):
+    # Loop the 20ms frame seconds*50 times: the "delay" between poses
+    # is itself the repeating pose wave, so the servos keep getting
+    # pulses for the whole hold (a plain delay opcode would let them
+    # go slack). 255,0 marks loop start; 255,1,lo,hi repeats it.
+    repeats = seconds * 50
+    return [255, 0, wave_id, 255, 1, repeats & 255, repeats >> 8]
 
 try:
     time.sleep(1)
-    
-    print("Calibrating all arms to neutral (0° and 180°)...")
-    set_angle(p1_right_pwm, 0)
-    set_angle(p1_left_pwm, 180)   # mirrored
-    set_angle(p2_right_pwm, 0)
-    set_angle(p2_left_pwm, 180)   # mirrored
-    time.sleep(3)
-
-    print("All arms attacking forward (90°)...")
-    set_angle(p1_right_pwm, 90)
-    set_angle(p1_left_pwm, 90)
-    set_angle(p2_right_pwm, 90)
-    set_angle(p2_left_pwm, 90)
-    time.sleep(3)
 
-    print("Returning all arms to neutral...")
-    set_angle(p1_right_pwm, 0)
-    set_angle(p1_left_pwm, 180)
-    set_angle(p2_right_pwm, 0)
-    set_angle(p2_left_pwm, 180)
-    time.sleep(3)
+    # The whole neutral -> attack -> neutral programme is compiled into
+    # one chain and handed to the DMA engine: Python is completely out
+    # of the loop for the 9-second sequence, and pose transitions land
+    # with microsecond rather than sleep() precision.
+    print("Running pose sequence: neutral -> attack -> neutral (3s each)...")
+    pi.wave_chain(
+        hold_pose(NEUTRAL_WAVE, 3)
+        + hold_pose(ATTACK_WAVE, 3)
+        + hold_pose(NEUTRAL_WAVE, 3)
+    )
+    while pi.wave_tx_busy():
+        time.sleep(0.1)
+    print("Sequence complete")
 
 except KeyboardInterrupt:
     print("\nStopped")
 
 finally:
-    p1_right_pwm.stop()
-    p1_left_pwm.stop()
-    p2_right_pwm.stop()
-    p2_left_pwm.stop()
-    GPIO.cleanup()
\ No newline at end of file
+    pi.wave_tx_stop()
+    pi.wave_clear()
+    for pin in ARM_PINS:
+        pi.write(pin, 0)
+    pi.stop()
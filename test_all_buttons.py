@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
-import RPi.GPIO as GPIO
-import time
+import mmap
+import os
+import signal
+import struct
+import gpio_shim as GPIO
 
 # Player 1 Controller Buttons
 P1_BTN_LEFT = 17
@@ -14,7 +17,8 @@ P2_BTN_RIGHT = 25
 P2_BTN_ATTACK_LEFT = 5
 P2_BTN_ATTACK_RIGHT = 6
 
-# Setup
+# Setup (the pigpio-backed shim configures direction and pull-ups;
+# only the level reads go through the register below)
 GPIO.setmode(GPIO.BCM)
 all_buttons = [
     P1_BTN_LEFT, P1_BTN_RIGHT, P1_BTN_ATTACK_LEFT, P1_BTN_ATTACK_RIGHT,
@@ -24,28 +28,51 @@ all_buttons = [
 for pin in all_buttons:
     GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
+# One 32-bit read of the GPLEV0 register returns every button level at
+# once - same trick as read_button_levels() in main.py - instead of
+# eight GPIO.input round-trips per iteration. All levels also come from
+# the same instant, so the printed line is a true snapshot.
+_GPLEV0 = 0x34
+_gpiomem_fd = os.open("/dev/gpiomem", os.O_RDWR | os.O_SYNC)
+_gpiomem = mmap.mmap(_gpiomem_fd, 4096)
+
+def read_bank():
+    return struct.unpack_from("<I", _gpiomem, _GPLEV0)[0]
+
+def print_state(channel=None):
+    """Print all button levels from one bank snapshot (edge callback)."""
+    bank = read_bank()
+    p1_left = (bank >> P1_BTN_LEFT) & 1
+    p1_right = (bank >> P1_BTN_RIGHT) & 1
+    p1_atk_l = (bank >> P1_BTN_ATTACK_LEFT) & 1
+    p1_atk_r = (bank >> P1_BTN_ATTACK_RIGHT) & 1
+
+    p2_left = (bank >> P2_BTN_LEFT) & 1
+    p2_right = (bank >> P2_BTN_RIGHT) & 1
+    p2_atk_l = (bank >> P2_BTN_ATTACK_LEFT) & 1
+    p2_atk_r = (bank >> P2_BTN_ATTACK_RIGHT) & 1
+
+    print(f"P1: L={p1_left} R={p1_right} AtkL={p1_atk_l} AtkR={p1_atk_r}  |  "
+          f"P2: L={p2_left} R={p2_right} AtkL={p2_atk_l} AtkR={p2_atk_r}")
+
 try:
     print("Button Test - Press Ctrl+C to exit")
     print("Buttons show 1 when NOT pressed, 0 when PRESSED")
     print("-" * 80)
-    
-    while True:
-        p1_left = GPIO.input(P1_BTN_LEFT)
-        p1_right = GPIO.input(P1_BTN_RIGHT)
-        p1_atk_l = GPIO.input(P1_BTN_ATTACK_LEFT)
-        p1_atk_r = GPIO.input(P1_BTN_ATTACK_RIGHT)
-        
-        p2_left = GPIO.input(P2_BTN_LEFT)
-        p2_right = GPIO.input(P2_BTN_RIGHT)
-        p2_atk_l = GPIO.input(P2_BTN_ATTACK_LEFT)
-        p2_atk_r = GPIO.input(P2_BTN_ATTACK_RIGHT)
-        
-        print(f"P1: L={p1_left} R={p1_right} AtkL={p1_atk_l} AtkR={p1_atk_r}  |  "
-              f"P2: L={p2_left} R={p2_right} AtkL={p2_atk_l} AtkR={p2_atk_r}")
-        
-        time.sleep(0.2)
-        
+
+    # Edge-triggered instead of 5Hz polling: the kernel wakes us only
+    # when a button actually changes, so idle CPU is zero, press
+    # latency is ~1ms instead of the 0-200ms polling window, and the
+    # console shows one line per change rather than 5 duplicates/s.
+    for pin in all_buttons:
+        GPIO.add_event_detect(pin, GPIO.BOTH, callback=print_state, bouncetime=10)
+
+    print_state()   # initial state
+    signal.pause()  # callbacks do all the work from here
+
 except KeyboardInterrupt:
     print("\nStopped")
 finally:
-    GPIO.cleanup()
\ No newline at end of file
+    _gpiomem.close()
+    os.close(_gpiomem_fd)
+    GPIO.cleanup()
@@ -1,30 +1,62 @@
 #!/usr/bin/env python3
 import spidev
+import sys
 import time
-import RPi.GPIO as GPIO
+import gpio_shim as GPIO
 
 spi = spidev.SpiDev()
 spi.open(0, 0)
 spi.max_speed_hz = 1350000
 
-def read_adc(channel):
-    adc = spi.xfer2([1, (8 + channel) << 4, 0])
-    return ((adc[1] & 3) << 8) + adc[2]
+# One prebuilt 3-byte command per channel. The MCP3008 needs a CS
+# pulse between samples (its start-bit detector arms once per CS
+# assertion), so the four FSRs are read as four short back-to-back
+# xfer2 transactions rather than one batched frame.
+CMDS = tuple([1, (8 + ch) << 4, 0] for ch in range(4))
+
+# Per-channel calibration offsets (FSR1 reads ~75 at rest) - a data
+# table instead of a special case in the loop body
+OFFSETS = (0, 75, 0, 0)
+
+# Bind the hot-loop callables once: dotted attribute lookups are dict
+# probes in CPython, pointless to repeat per iteration
+_xfer = spi.xfer2
+_sleep = time.sleep
+
+def read_all_fsr():
+    vals = []
+    for cmd, off in zip(CMDS, OFFSETS):
+        r = _xfer(list(cmd))
+        vals.append(max((((r[1] & 3) << 8) | r[2]) - off, 0))
+    return tuple(vals)
+
+# print() does Unicode formatting, takes the stdio lock and flushes on
+# every newline - more work than the SPI transfer itself. Write
+# %-formatted bytes straight to the stdout buffer instead, flushing
+# only when a changed reading is emitted (see the loop below), so the
+# loop stays cheap even at faster poll rates.
+_FMT = b"FSR0: %4d  |  FSR1: %4d  |  FSR2: %4d  |  FSR3: %4d\n"
+_out = sys.stdout.buffer.write
+_flush = sys.stdout.buffer.flush
 
 try:
     print("4-FSR Test - Press Ctrl+C to exit")
     print("-" * 60)
+    prev = None
     while True:
-        fsr0 = read_adc(0)
-        fsr1 = max(read_adc(1) -75,0) 
-        fsr2 = read_adc(2)
-        fsr3 = read_adc(3)
-        
-        print(f"FSR0: {fsr0:4d}  |  FSR1: {fsr1:4d}  |  FSR2: {fsr2:4d}  |  FSR3: {fsr3:4d}")
-        time.sleep(0.2)
-        
+        vals = read_all_fsr()
+
+        # Only changes reach the console: with stable sensors the loop
+        # does no output work at all, so the poll rate can rise freely
+        # and the readout stops scrolling identical lines
+        if vals != prev:
+            _out(_FMT % vals)
+            _flush()  # changes are rare, flush so they show immediately
+            prev = vals
+        _sleep(0.2)
+
 except KeyboardInterrupt:
     print("\nStopped")
 finally:
     spi.close()
-    GPIO.cleanup()
\ No newline at end of file
+    GPIO.cleanup()
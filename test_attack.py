@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import RPi.GPIO as GPIO
+import gpio_shim as GPIO
 import time
 
 # Right and Left servo pins
@@ -1,49 +1,48 @@
 #!/usr/bin/env python3
-import RPi.GPIO as GPIO  # Library to control Pi GPIO pins
+import gpio_shim as GPIO
 import time              # For delays
 
 RIGHT_SERVO = 5    # RIGHT wheel servo on GPIO 5.
 LEFT_SERVO = 6   # LEFT wheel servo on GPIO 6
 
+# Duty cycles for each phase (LEFT is mirrored, so directions oppose).
+# 0% = no pulse (continuous servo coasts/stops).
+FWD_R, FWD_L = 6, 8
+REV_R, REV_L = 8, 6
+STOP_R, STOP_L = 0, 0
+
+# (label, right duty, left duty, seconds) - the sequence is data, so
+# retuning a run is editing this table rather than the code below
+SEQUENCE = [
+    ("Moving FORWARD", FWD_R, FWD_L, 1),
+    (None, STOP_R, STOP_L, 1),
+    ("Moving BACKWARD", REV_R, REV_L, 1),
+    (None, STOP_R, STOP_L, 1),
+]
+
 GPIO.setmode(GPIO.BCM)              # Use BCM pin numbering (GPIO numbers, not physical pin numbers)
 GPIO.setup(RIGHT_SERVO, GPIO.OUT)    # Set GPIO 5 as output
 GPIO.setup(LEFT_SERVO, GPIO.OUT)   # Set GPIO 6 as output
 
-time.sleep(1)
 RIGHT_pwm = GPIO.PWM(RIGHT_SERVO, 50)   # Create PWM on GPIO 5, 50Hz frequency (servos need 50Hz)
 LEFT_pwm = GPIO.PWM(LEFT_SERVO, 50) # Create PWM on GPIO 6, 50Hz frequency
 RIGHT_pwm.start(0)    # Start PWM with 0% duty cycle (off).
 LEFT_pwm.start(0)   # Start PWM with 0% duty cycle (off)
-time.sleep(.5)
-print("3")
-time.sleep(.5)
-print("2")
-time.sleep(.5)
-print("1")
-
-# Forward
-print("Moving FORWARD")
-RIGHT_pwm.ChangeDutyCycle(6)    # 2.5% duty cycle = full speed clockwise
-LEFT_pwm.ChangeDutyCycle(8)  # 12.5% duty cycle = full speed counter-clockwise (opposite direction because servo is mirrored)
-time.sleep(1)                   # Run for 0.5 seconds
-
-# Stop
-RIGHT_pwm.ChangeDutyCycle(0)    # 7.5% duty cycle = stop position for continuous servos
-LEFT_pwm.ChangeDutyCycle(0)   # Both servos stopped
-time.sleep(1)                  # Stay stopped for 0.5 seconds
-
-# Backward
-print("Moving BACKWARD")
-RIGHT_pwm.ChangeDutyCycle(8)   # Reverse direction: counter-clockwise
-LEFT_pwm.ChangeDutyCycle(6)   # Reverse direction: clockwise (opposite of RIGHT)
-time.sleep(1)                   # Run for 0.5 seconds
-
-# Stop
-RIGHT_pwm.ChangeDutyCycle(0)    # Stop both servos
-LEFT_pwm.ChangeDutyCycle(0)
-time.sleep(1)
+
+# Pre-bind the duty setters; 0.2s is enough for the PWM carrier to
+# settle (the old 1s + 3-step countdown just slowed down test runs)
+change_r = RIGHT_pwm.ChangeDutyCycle
+change_l = LEFT_pwm.ChangeDutyCycle
+time.sleep(0.2)
+
+for label, duty_r, duty_l, seconds in SEQUENCE:
+    if label:
+        print(label)
+    change_r(duty_r)
+    change_l(duty_l)
+    time.sleep(seconds)
 
 RIGHT_pwm.stop()     # Turn off PWM signal on RIGHT servo
 LEFT_pwm.stop()    # Turn off PWM signal on LEFT servo
 GPIO.cleanup()      # Reset all GPIO pins to default state (important for next run)
-print("Done")
\ No newline at end of file
+print("Done")
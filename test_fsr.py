@@ -1,16 +1,21 @@
 import spidev  # Library to communicate with SPI devices (MCP3008 uses SPI)
 import time    # For sleep delays
-import RPi.GPIO as GPIO
+import gpio_shim as GPIO
 
 spi = spidev.SpiDev()  # Create SPI object
 spi.open(0, 0)         # Open SPI bus 0, device 0 (CE0)
 spi.max_speed_hz = 1350000  # Set SPI speed to 1.35 MHz
 
+# Command triplets built once per channel - [1, (8 + ch) << 4, 0] is
+# the format MCP3008 expects. Rebuilding that list on every call is a
+# fresh allocation per sample, which adds up (and feeds the GC) on a
+# polling loop.
+_CMD = tuple([1, (8 + ch) << 4, 0] for ch in range(8))
+
 def read_adc(channel):
     # Send 3 bytes to MCP3008, get 3 bytes back
-    # [1, (8 + channel) << 4, 0] is the command format MCP3008 expects
-    adc = spi.xfer2([1, (8 + channel) << 4, 0])
-    
+    adc = spi.xfer2(_CMD[channel])
+
     # MCP3008 returns 10-bit result spread across bytes 2 and 3
     # Extract and combine them into a single number (0-1023)
     return ((adc[1] & 3) << 8) + adc[2]
@@ -1,4 +1,4 @@
-import RPi.GPIO as GPIO
+import gpio_shim as GPIO
 
 GPIO.setmode(GPIO.BCM)
 GPIO.setup(4, GPIO.OUT)